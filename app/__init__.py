@@ -1,8 +1,8 @@
 """__inti__.py."""
 
-from flasgger import Swagger
+import os
+
 from flask import Flask
-from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 
 from db_config import config_by_name
@@ -13,7 +13,14 @@ db = SQLAlchemy()
 
 def create_app(config_name="dev"):
     """Initialize the Flask application."""
+    # CORS and Swagger are only needed once an app is actually built, so their imports are
+    # deferred to keep `import app` cheap for CLI scripts, workers and test collection.
+    from flask_cors import CORS
+
+    from utils.json_provider import MsgspecJSONProvider
+
     app = Flask(__name__)
+    app.json = MsgspecJSONProvider(app)
 
     CORS(app, resources={r"/api/*": {"origins": "*"}})
 
@@ -23,16 +30,26 @@ def create_app(config_name="dev"):
     # Initialize the extensions
     db.init_app(app)
 
-    # Initialize Swagger
+    # Initialize Swagger (flasgger is only imported when it is used)
     if config_name == "dev":
+        from flasgger import Swagger
+
         Swagger(app)
 
     # Import and register blueprints
-    from app.api.auth_routes import auth_blueprint
+    # Route modules themselves are only imported on their first request (see app/api/__init__.py)
+    from app.api import auth_blueprint
 
     # from app.models.user_model import User
     # from app.models.user_profile_model import UserProfile
 
     app.register_blueprint(auth_blueprint, url_prefix="/api/authentication")
 
+    # Run the one-time setup of the email validation now, at process start, rather than in the first
+    # sign-up; set SYNTX_SKIP_WARMUP to skip it (e.g. in tests)
+    if not os.getenv("SYNTX_SKIP_WARMUP"):
+        from utils.validation import warmup
+
+        warmup()
+
     return app
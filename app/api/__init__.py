@@ -1 +1,83 @@
-"""app/api/__init__.py."""
+"""
+app/api/__init__.py.
+
+URL rules for the API blueprints.
+
+The view functions live in their own route modules (e.g. `auth_routes.py`), which pull in JWT,
+bcrypt and the DNS-backed email validation. The rules are registered here against `LazyView`
+wrappers so those modules are only imported when a request first hits one of their routes,
+rather than every time an application is created.
+
+Classes:
+    - LazyView: A view function proxy that imports the real view on first use.
+"""
+
+import os
+from functools import cached_property
+
+from dotenv import load_dotenv
+from flask import Blueprint, jsonify, request
+from werkzeug.utils import import_string
+
+
+class LazyView:
+    # Proxy for a view function that is imported the first time it is called. `import_name` is
+    # the dotted path of the view, e.g. "app.api.auth_routes.sign_up". There is no class docstring
+    # because `__doc__` is a property forwarding the real view's docstring.
+
+    def __init__(self, import_name):
+        self.__module__, self.__name__ = import_name.rsplit(".", 1)
+        self.import_name = import_name
+
+    @cached_property
+    def view(self):
+        """Import and return the real view function."""
+        return import_string(self.import_name)
+
+    # Flasgger builds the API spec from the view docstrings and source files, so both are
+    # resolved on demand from the real view.
+    @property
+    def __doc__(self):
+        return self.view.__doc__
+
+    @property
+    def __wrapped__(self):
+        return self.view
+
+    def __call__(self, *args, **kwargs):
+        return self.view(*args, **kwargs)
+
+
+auth_blueprint = Blueprint("auth_api", __name__)
+
+
+@auth_blueprint.record_once
+def _load_env(state):
+    """
+    Load `.env` once, when the blueprint is first registered, before any route module reads it.
+
+    The route modules are only imported on their first request, so a missing JWT secret is checked
+    here to fail when the app is created rather than on every auth request.
+    """
+    load_dotenv()
+    if not os.getenv("JWT_SECRET_KEY"):
+        raise RuntimeError("JWT_SECRET_KEY is not set")
+
+
+# Endpoints that expect a JSON body (logout has no body)
+_JSON_ENDPOINTS = {"auth_api.sign_up", "auth_api.sign_in", "auth_api.refresh_token"}
+
+
+@auth_blueprint.before_request
+def _require_json():
+    """Reject non-JSON bodies sent to JSON endpoints before the body is read or the view is imported."""
+    # Only POST carries a body; CORS preflight (OPTIONS) requests must pass through untouched
+    if request.method == "POST" and request.endpoint in _JSON_ENDPOINTS and not request.is_json:
+        return jsonify({"error": "Content-Type must be application/json"}), 415
+    return None
+
+
+auth_blueprint.add_url_rule("/signup", view_func=LazyView("app.api.auth_routes.sign_up"), methods=["POST"])
+auth_blueprint.add_url_rule("/login", view_func=LazyView("app.api.auth_routes.sign_in"), methods=["POST"])
+auth_blueprint.add_url_rule("/refresh", view_func=LazyView("app.api.auth_routes.refresh_token"), methods=["POST"])
+auth_blueprint.add_url_rule("/logout", view_func=LazyView("app.api.auth_routes.logout"), methods=["POST"])
@@ -1,36 +1,66 @@
-"""auth_routes.py."""
+"""
+auth_routes.py.
+
+View functions for the authentication API. The URL rules are registered in `app/api/__init__.py`,
+which imports this module lazily on the first request to one of its routes.
+"""
+
+from contextlib import suppress
 
 import jwt
-from dotenv import load_dotenv
-from flask import Blueprint, jsonify, request
+import msgspec
+from flask import Response, jsonify, request
+from sqlalchemy.exc import IntegrityError
 
+from app import db
+from app.api.schemas import refresh_decoder, sign_in_decoder, sign_up_decoder
 from app.models.user_model import User
+from utils.bcrypt_pool import BcryptPoolBusyError, check_dummy_password, check_password, hash_password, needs_rehash
 from utils.database import save_to_db
 from utils.jwt_utils import (
-    SECRET_KEY,
     blacklist,
+    decode_token,
     generate_refresh_token,
     generate_token,
+    get_bearer_token,
     token_required,
 )
 from utils.validation import validate_email_address, validate_password
 
-load_dotenv()
-
-auth_blueprint = Blueprint("auth_api", __name__)
+# Fixed error bodies, serialized once at import instead of by `jsonify` on every request. They are
+# encoded with msgspec like every other response (see utils/json_provider.py), so the output matches.
+_ERRORS = {
+    key: (msgspec.json.encode(body), status)
+    for key, (body, status) in {
+        "invalid_email": ({"status": 400, "message": "Invalid email address"}, 400),
+        "user_exists": ({"status": 400, "message": "User with this email or username already exists"}, 400),
+        "user_not_found": ({"error": "User not found"}, 404),
+        "wrong_password": ({"error": "Password validation failed"}, 400),
+        "refresh_token_missing": ({"error": "Refresh token missing"}, 400),
+        "invalid_refresh_token": ({"error": "Invalid refresh token"}, 401),
+        "refresh_token_expired": ({"error": "Refresh token expired"}, 401),
+        "invalid_token": ({"error": "Invalid token"}, 403),
+        "server_busy": ({"error": "Server is busy, please try again"}, 503),
+    }.items()
+}
+
+
+def _error_response(key, headers=None):
+    """Build a JSON error response from one of the pre-serialized `_ERRORS` bodies."""
+    body, status = _ERRORS[key]
+    return Response(body, status=status, mimetype="application/json", headers=headers)
 
 
-@auth_blueprint.route("/signup", methods=["POST"])
 def sign_up():
     """
     Handle user sign-up.
 
     This route registers a new user. It performs the following steps:
-        - Validates the incoming JSON data to ensure required fields are present.
+        - Decodes the incoming JSON body, ensuring required fields are present and are strings.
         - Validates the email address format and password strength.
-        - Checks if the user already exists by username or email.
         - Hashes the password using bcrypt.
-        - Creates a new User object and stores it in the database.
+        - Creates a new User object and stores it in the database, relying on the unique
+          constraints on username and email to reject existing users.
         - Returns a success response with a 201 status code.
 
     Returns:
@@ -72,23 +102,24 @@ def sign_up():
               type: string
       400:
         description: Validation error or user already exists
+      415:
+        description: Request body is not JSON
+      503:
+        description: Too many password hashing jobs pending, retry after the `Retry-After` delay
 
     """
-    data = request.get_json()
-
-    # Check if all necessary inputs are given
-    if not data or "username" not in data or "email" not in data or "password" not in data:
-        return jsonify(
-            status=400,
-            message="Missing required fields: 'username', 'email' or 'password'",
-        )
+    # Decode the body and check that all necessary inputs are given, in one pass
+    try:
+        data = sign_up_decoder.decode(request.get_data(cache=False))
+    except msgspec.DecodeError as e:
+        return jsonify({"error": "Invalid request body", "details": str(e)}), 400
 
-    # Check if email is valid
-    if not validate_email_address(data["email"], check_mx=True):
-        return jsonify(status=400, message="Invalid email address"), 400
+    # Check if email is valid (format and email-validator checks only, so no DNS lookup blocks the request)
+    if not validate_email_address(data.email, check_mx=False, normalize=True):
+        return _error_response("invalid_email")
 
     # Validate the password
-    is_valid_password, password_errors = validate_password(data["password"])
+    is_valid_password, password_errors = validate_password(data.password)
     if not is_valid_password:
         return (
             jsonify(
@@ -97,25 +128,23 @@ def sign_up():
             400,
         )
 
-    # Check if user already exists
-    if User.query.filter_by(username=data["username"]).first() or User.query.filter_by(email=data["email"]).first():
-        return (
-            jsonify(
-                status=400,
-                message="User with this email or username already exists",
-            ),
-            400,
+    # Create a new User object (hashing the password can be rejected when the bcrypt pool is saturated)
+    try:
+        new_user = User(
+            username=data.username,
+            email=data.email,
+            password=data.password,
+            role="user",
         )
+    except BcryptPoolBusyError:
+        return _error_response("server_busy", headers={"Retry-After": "1"})
 
-    # Create a new User object
-    new_user = User(
-        username=data["username"],
-        email=data["email"],
-        password=data["password"],
-        role="user",
-    )
-
-    save_to_db(new_user)
+    # The unique constraints on username and email reject existing users, which avoids a racy SELECT beforehand
+    try:
+        save_to_db(new_user)
+    except IntegrityError:
+        db.session.rollback()
+        return _error_response("user_exists")
 
     access_token = generate_token(new_user.id)
     refresh_token = generate_refresh_token(new_user.id)
@@ -132,7 +161,6 @@ def sign_up():
     )
 
 
-@auth_blueprint.route("/login", methods=["POST"])
 def sign_in():
     """
     Handle user sign-in.
@@ -175,42 +203,54 @@ def sign_in():
             refresh_token:
               type: string
       400:
-        description: Missing required fields or validation failed
+        description: Invalid request body or password validation failed
+      415:
+        description: Request body is not JSON
       404:
         description: User not found
+      503:
+        description: Too many password hashing jobs pending, retry after the `Retry-After` delay
 
     """
-    data = request.get_json()
+    # Decode the body and check that all necessary inputs are given, in one pass
+    try:
+        data = sign_in_decoder.decode(request.get_data(cache=False))
+    except msgspec.DecodeError as e:
+        return jsonify({"error": "Invalid request body", "details": str(e)}), 400
 
-    # Check if all necessary inputs are given
-    if not data or "username_or_email" not in data or "password" not in data:
-        return (
-            jsonify(
-                {"error": "Missing required fields: 'username_or_email' or 'password'"},
-            ),
-            400,
-        )
+    # Find the user's id and password hash by email or username
+    credentials = User.find_credentials(data.username_or_email)
 
-    username_or_email = data.get("username_or_email")
+    # Verify the password using bcrypt. Unknown users are checked against a dummy hash so that
+    # both cases take the same time and cannot be told apart by timing.
+    try:
+        if credentials:
+            is_valid_password = check_password(data.password, credentials.password_hash)
+        else:
+            is_valid_password = check_dummy_password(data.password)
+    except BcryptPoolBusyError:
+        return _error_response("server_busy", headers={"Retry-After": "1"})
 
-    # Find the user by email or username
-    user = User.find_by_username_or_email(username_or_email)
+    if not credentials:
+        return _error_response("user_not_found")
 
-    if not user:
-        return jsonify({"error": "User not found"}), 404
+    if not is_valid_password:
+        return _error_response("wrong_password")
 
-    # Verify the password using bcrypt
-    if not user.check_password(data["password"]):
-        return jsonify({"error": "Password validation failed"}), 400
+    # Bring hashes made with a previous BCRYPT_COST to the current one while the password is at hand.
+    # If the pool is busy the upgrade is left for a later login.
+    if needs_rehash(credentials.password_hash):
+        with suppress(BcryptPoolBusyError):
+            User.update_password_hash(credentials.id, hash_password(data.password))
 
-    access_token = generate_token(user.id)
-    refresh_token = generate_refresh_token(user.id)
+    access_token = generate_token(credentials.id)
+    refresh_token = generate_refresh_token(credentials.id)
 
     return (
         jsonify(
             {
                 "message": "Login successful",
-                "user_id": user.id,
+                "user_id": credentials.id,
                 "access_token": access_token,
                 "refresh_token": refresh_token,
             },
@@ -219,7 +259,6 @@ def sign_in():
     )
 
 
-@auth_blueprint.route("/refresh", methods=["POST"])
 def refresh_token():
     """
     Refresh the access token using a valid refresh token.
@@ -252,34 +291,39 @@ def refresh_token():
             access_token:
               type: string
       400:
-        description: Missing refresh token
+        description: Invalid request body or missing refresh token
+      415:
+        description: Request body is not JSON
       401:
         description: Invalid or expired refresh token
 
     """
-    data = request.get_json()
-    refresh_token = data.get("refresh_token")
+    try:
+        refresh_token = refresh_decoder.decode(request.get_data(cache=False)).refresh_token
+    except msgspec.DecodeError as e:
+        return jsonify({"error": "Invalid request body", "details": str(e)}), 400
+
     if not refresh_token:
-        return jsonify({"error": "Refresh token missing"}), 400
+        return _error_response("refresh_token_missing")
 
     try:
         # Decode the refresh token
-        decode = jwt.decode(refresh_token, SECRET_KEY, algorithms=["HS256"])
-        user = User.query.filter_by(id=decode["user_id"]).first()
+        decode = decode_token(refresh_token)
+        # Primary-key lookup, served from the session's identity map when the user is already loaded
+        user = db.session.get(User, decode["user_id"])
 
         if not user:
-            return jsonify({"error": "Invalid refresh token"}), 401
+            return _error_response("invalid_refresh_token")
 
         new_access_token = generate_token(user.id)
 
         return jsonify({"access_token": new_access_token}), 200
     except jwt.ExpiredSignatureError:
-        return jsonify({"error": "Refresh token expired"}), 401
+        return _error_response("refresh_token_expired")
     except jwt.InvalidTokenError:
-        return jsonify({"error": "Invalid token"}), 403
+        return _error_response("invalid_token")
 
 
-@auth_blueprint.route("/logout", methods=["POST"])
 @token_required
 def logout(current_user):
     """
@@ -310,11 +354,13 @@ def logout(current_user):
             message:
               type: string
       401:
-        description: Invalid token or not provided
+        description: Missing or malformed Authorization header
+      403:
+        description: Invalid, expired or blacklisted token
 
     """
     # Get the token from the request
-    token = request.headers["Authorization"].split(" ")[1]
+    token = get_bearer_token()
 
     # Add the token to the blacklist
     blacklist.add(token)
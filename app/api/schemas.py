@@ -0,0 +1,41 @@
+"""
+Request body schemas for the API.
+
+This module defines the JSON bodies accepted by the API routes as `msgspec` structs, together with
+a decoder for each one. The decoders are built once at import and turn the raw request body into a
+typed struct in a single pass, rejecting malformed JSON, missing fields and wrongly typed values
+with a `msgspec.DecodeError`.
+
+Classes:
+    - SignUpBody: The body of a sign-up request.
+    - SignInBody: The body of a sign-in request.
+    - RefreshBody: The body of a token refresh request.
+"""
+
+import msgspec
+
+
+class SignUpBody(msgspec.Struct):
+    """Body of a sign-up request."""
+
+    username: str
+    email: str
+    password: str
+
+
+class SignInBody(msgspec.Struct):
+    """Body of a sign-in request."""
+
+    username_or_email: str
+    password: str
+
+
+class RefreshBody(msgspec.Struct):
+    """Body of a token refresh request."""
+
+    refresh_token: str
+
+
+sign_up_decoder = msgspec.json.Decoder(SignUpBody)
+sign_in_decoder = msgspec.json.Decoder(SignInBody)
+refresh_decoder = msgspec.json.Decoder(RefreshBody)
@@ -9,6 +9,8 @@ Classes:
     - PostCategories: Represents the association between posts and categories.
 """
 
+from sqlalchemy.dialects.postgresql import insert
+
 from app import db
 
 
@@ -30,6 +32,9 @@ class PostCategories(db.Model):
     post_id = db.Column(db.Integer, db.ForeignKey("posts.id"), primary_key=True, nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey("categories.id"), primary_key=True, nullable=False)
 
+    # The primary key (post_id, category_id) serves `find_by_post`; this one serves `find_by_category`
+    __table_args__ = (db.Index("ix_post_categories_category_id", category_id),)
+
     def __repr__(self):
         return f"<PostCategories(post_id={self.post_id}, category_id={self.category_id})>"
 
@@ -48,6 +53,25 @@ class PostCategories(db.Model):
         """Find all posts associated with a specific category."""
         return cls.query.filter_by(category_id=category_id).all()
 
+    @classmethod
+    def bulk_create(cls, pairs):
+        """
+        Create many post-category associations with a single INSERT and commit.
+
+        Pairs that are already associated are skipped with `ON CONFLICT DO NOTHING`, so the call is
+        idempotent and a duplicate does not abort the transaction.
+
+        Parameters
+        ----------
+        pairs : iterable of tuple
+            The `(post_id, category_id)` pairs to associate.
+
+        """
+        rows = [{"post_id": post_id, "category_id": category_id} for post_id, category_id in pairs]
+        if rows:
+            db.session.execute(insert(cls).on_conflict_do_nothing(index_elements=["post_id", "category_id"]), rows)
+            db.session.commit()
+
     def save(self):
         """Save the post-category association to the database."""
         db.session.add(self)
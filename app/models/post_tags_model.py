@@ -9,6 +9,8 @@ Classes:
     - PostTags: Represents the association between posts and tags.
 """
 
+from sqlalchemy.dialects.postgresql import insert
+
 from app import db
 
 
@@ -30,6 +32,9 @@ class PostTags(db.Model):
     post_id = db.Column(db.Integer, db.ForeignKey("posts.id"), primary_key=True, nullable=False)
     tag_id = db.Column(db.Integer, db.ForeignKey("tags.id"), primary_key=True, nullable=False)
 
+    # The primary key (post_id, tag_id) serves `find_by_post`; this one serves `find_by_tag`
+    __table_args__ = (db.Index("ix_post_tags_tag_id", tag_id),)
+
     def __repr__(self):
         return f"<PostTags(post_id={self.post_id}, tag_id={self.tag_id})>"
 
@@ -48,6 +53,25 @@ class PostTags(db.Model):
         """Find all posts associated with a specific tag."""
         return cls.query.filter_by(tag_id=tag_id).all()
 
+    @classmethod
+    def bulk_create(cls, pairs):
+        """
+        Create many post-tag associations with a single INSERT and commit.
+
+        Pairs that are already associated are skipped with `ON CONFLICT DO NOTHING`, so the call is
+        idempotent and a duplicate does not abort the transaction.
+
+        Parameters
+        ----------
+        pairs : iterable of tuple
+            The `(post_id, tag_id)` pairs to associate.
+
+        """
+        rows = [{"post_id": post_id, "tag_id": tag_id} for post_id, tag_id in pairs]
+        if rows:
+            db.session.execute(insert(cls).on_conflict_do_nothing(index_elements=["post_id", "tag_id"]), rows)
+            db.session.commit()
+
     def save(self):
         """Save the post-tag association to the database."""
         db.session.add(self)
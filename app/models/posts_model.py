@@ -11,13 +11,22 @@ Classes:
       and `updated_at`.
 """
 
-from datetime import datetime, timezone
-
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import Column, Computed, DateTime, ForeignKey, Index, Integer, String, func, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 
 from app import db
 
 
+def _search_vector(title, content):
+    """Build the full-text search vector of a post from its title and content columns, for use in DDL."""
+    empty = literal_column("''")
+    return func.to_tsvector(
+        literal_column("'english'"),
+        func.coalesce(title, empty) + literal_column("' '") + func.coalesce(content, empty),
+    )
+
+
 class Posts(db.Model):
     """
     Represents a blog post in the system.
@@ -31,21 +40,37 @@ class Posts(db.Model):
         status (str): The status of the post. (e.g. draft, published).
         created_at (datetime): The creation timestamp of the post.
         updated_at (datetime): The last update timestamp of the post.
+        search_vector (str): The full-text search vector of the title and content, computed by the
+            database. It is deferred, so it is only loaded when accessed.
 
     """
 
-    __tablename__ = "Posts"
+    __tablename__ = "posts"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("Users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"))
     title = Column(String, nullable=False)
     content = Column(String, nullable=False)
     status = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Stored generated column, so the vector is computed once per write rather than at query time
+    search_vector = deferred(Column(TSVECTOR, Computed(_search_vector(title, content), persisted=True)))
+
+    __table_args__ = (
+        # GIN index for the full-text search in `search_posts`
+        Index("ix_posts_search", search_vector, postgresql_using="gin"),
+        # Lets `get_recent_posts` read the newest posts straight from the index
+        Index("ix_posts_created_at_desc", created_at.desc()),
+        # Lookups of `find_by_user`, `find_by_status` and `find_by_title`
+        Index("ix_posts_user_id", user_id),
+        Index("ix_posts_status", status),
+        Index("ix_posts_title", title),
+    )
 
     def __repr__(self):
-        return f"<Post: {self.id}, {self.title}, {self.content}, {self.status}, {self.created_at}, {self.updated_at}>"
+        # Only the id, so logging a post does not format (or load) its whole content
+        return f"<Post: {self.id}>"
 
     def __str__(self):
         """Return a string representation of the post."""
@@ -69,7 +94,7 @@ class Posts(db.Model):
 
     @classmethod
     def find_by_id(cls, post_id):
-        return cls.query.get(post_id)
+        return db.session.get(cls, post_id)
 
     @classmethod
     def find_by_title(cls, title):
@@ -83,17 +108,58 @@ class Posts(db.Model):
     def find_by_status(cls, status):
         return cls.query.filter_by(status=status).all()
 
+    @classmethod
+    def exists_by_user(cls, user_id):
+        """Tell whether a user has any post, without loading the posts."""
+        return db.session.query(cls.query.filter_by(user_id=user_id).exists()).scalar()
+
+    @classmethod
+    def count_by_status(cls, status):
+        """Count the posts with a given status, without loading the posts."""
+        return db.session.query(func.count(cls.id)).filter_by(status=status).scalar()
+
     def publish_post(self):
         self.status = "Published"
-        self.updated_at = datetime.now(timezone.utc)
         db.session.commit()
 
     @classmethod
     def search_posts(cls, keyword):
-        return cls.query.filter(
-            (cls.title.ilike(f"%{keyword}%"))(cls.content.ilike(f"%{keyword}%")),
-        ).all()
+        """
+        Find posts whose title or content match the keyword(s) using full-text search.
+
+        The query matches the stored `search_vector` column, so it is served by the `ix_posts_search`
+        GIN index without computing any vector.
+        """
+        return cls.query.filter(cls.search_vector.op("@@")(func.plainto_tsquery("english", keyword))).all()
 
     @classmethod
     def get_recent_posts(cls, limit=10):
-        return sorted(cls.query.order_by(cls.created_at).limit(limit).all(), reverse=True)
+        """Return the `limit` most recently created posts, newest first."""
+        return cls.query.order_by(cls.created_at.desc()).limit(limit).all()
+
+    @classmethod
+    def list_summaries(cls, limit=None):
+        """
+        Return summaries of the posts, newest first, without their content.
+
+        Only the summary columns are selected and the rows are turned into dictionaries directly,
+        so the post content is neither transferred nor loaded into `Posts` instances.
+
+        Parameters
+        ----------
+        limit : int, optional
+            The maximum number of posts to return. All posts are returned by default.
+
+        Returns
+        -------
+        list of dict
+            The `id`, `title`, `status` and `created_at` of each post.
+
+        """
+        rows = (
+            db.session.query(cls.id, cls.title, cls.status, cls.created_at)
+            .order_by(cls.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+        return [row._asdict() for row in rows]
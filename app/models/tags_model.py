@@ -5,15 +5,26 @@ This module defines the `Tags` class, which represents tags within the system. I
 attributes such as the tag name and creation timestamp. The class also provides methods for
 converting tag data into a dictionary format, retrieving tags by name, and getting all tags.
 
+Tags change rarely, so the serialized list of all tags is kept in a short-lived in-process cache,
+which is cleared whenever a transaction that inserted, updated or deleted a tag is committed or
+rolled back.
+
 Classes:
     - Tags: Represents a tag with attributes like `tag` and `created_at`.
 """
 
-from DateTime import DateTime
-from sqlalchemy import func
+import threading
+from itertools import chain
+
+from cachetools import TTLCache, cached
+from sqlalchemy import DateTime, event, func
+from sqlalchemy.orm import Session
 
 from app import db
 
+ALL_TAGS_CACHE_TTL = 60  # seconds
+_all_tags_cache = TTLCache(maxsize=1, ttl=ALL_TAGS_CACHE_TTL)
+
 
 class Tags(db.Model):
     """
@@ -30,7 +41,7 @@ class Tags(db.Model):
     __tablename__ = "tags"
 
     id = db.Column(db.Integer, primary_key=True)
-    tag = db.Column(db.String(255))
+    tag = db.Column(db.String(255), unique=True, nullable=False)
     created_at = db.Column(DateTime(timezone=True), server_default=func.now())
 
     def __repr__(self):
@@ -57,3 +68,45 @@ class Tags(db.Model):
     @classmethod
     def get_all(cls):
         return cls.query.all()
+
+    @classmethod
+    @cached(_all_tags_cache, key=lambda cls: "all", lock=threading.Lock())
+    def _all_tag_dicts(cls):
+        return tuple(tag.to_dict() for tag in cls.query.all())
+
+    @classmethod
+    def get_all_dicts(cls):
+        """
+        Return every tag as a dictionary, served from a cache for up to `ALL_TAGS_CACHE_TTL` seconds.
+
+        Callers get their own copy of the list and its dictionaries, so changing them does not alter the cache.
+        """
+        return [dict(tag) for tag in cls._all_tag_dicts()]
+
+
+# Flag set in `Session.info` when a flush wrote tags, so the cache is cleared once the outcome is known
+_TAGS_CHANGED = "tags_changed"
+
+
+@event.listens_for(Session, "after_flush")
+def _record_tag_changes(session, flush_context):
+    """Remember that the transaction changed tags; the cache is only cleared when it ends."""
+    if any(isinstance(obj, Tags) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info[_TAGS_CHANGED] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_all_tags_cache_on_commit(session):
+    """Drop the cached list of tags once changed tags are committed."""
+    if session.info.pop(_TAGS_CHANGED, False):
+        _all_tags_cache.clear()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _invalidate_all_tags_cache_on_rollback(session, previous_transaction):
+    """Drop the cached list of tags, which may hold flushed but rolled back tags."""
+    if session.info.get(_TAGS_CHANGED):
+        _all_tags_cache.clear()
+        # Changes flushed before a rolled back savepoint are still pending in the outer transaction
+        if not previous_transaction.nested:
+            del session.info[_TAGS_CHANGED]
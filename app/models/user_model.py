@@ -11,10 +11,12 @@ Classes:
       and `created_at`.
 """
 
-import bcrypt
-from sqlalchemy import Column, DateTime, Integer, String, func
+from sqlalchemy import Column, DateTime, Index, Integer, String, func
+from sqlalchemy.orm import relationship
 
 from app import db
+from app.models.user_profile_model import UserProfile
+from utils import bcrypt_pool
 
 
 class User(db.Model):
@@ -29,24 +31,33 @@ class User(db.Model):
         password_hash (str): The hashed and salted password.
         role (str): The user's role in the system.
         created_at (datetime): The timestamp of when the user was created.
+        profile (UserProfile): The user's profile, loaded together with the user.
 
     """
 
     __tablename__ = "users"
+    # The unique indexes also cover the columns needed to authenticate, so logins are index-only scans
+    __table_args__ = (
+        Index("ix_users_username", "username", unique=True, postgresql_include=["id", "password_hash"]),
+        Index("ix_users_email", "email", unique=True, postgresql_include=["id", "password_hash"]),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    username = Column(String(50), unique=True, nullable=False)
-    email = Column(String(50), unique=True, nullable=False)
+    username = Column(String(50), nullable=False)
+    email = Column(String(50), nullable=False)
     password_hash = Column(String(255), nullable=False)
     role = Column(String(50), default="user")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    # One-to-one, so it is joined into the query that loads the user instead of costing a query per user
+    profile = relationship(UserProfile, back_populates="user", uselist=False, lazy="joined")
+
     def __repr__(self):
-        return f"<User: {self.id}, {self.username}>, {self.email}>, {self.role}>, {self.created_at}>, {self.id}>"
+        return f"<User: {self.id}>"
 
     def __str__(self):
         """Return a string representation of the user."""
-        return f"User: {self.id}, {self.username}, email: {self.email}, role: {self.role}>"
+        return f"User: {self.id}, {self.username}, email: {self.email}, role: {self.role}"
 
     def __init__(self, username, email, password, role):
         self.username = username
@@ -65,12 +76,18 @@ class User(db.Model):
         }
 
     def set_password(self, password):
-        """Hash and set the password."""
-        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        """Hash and set the password (runs on the bcrypt pool, may raise `BcryptPoolBusyError`)."""
+        return bcrypt_pool.hash_password(password)
 
     def check_password(self, password):
-        """Check the hashed password."""
-        return bcrypt.checkpw(password.encode("utf-8"), self.password_hash.encode("utf-8"))
+        """Check the hashed password (runs on the bcrypt pool, may raise `BcryptPoolBusyError`)."""
+        return bcrypt_pool.check_password(password, self.password_hash)
+
+    @classmethod
+    def update_password_hash(cls, user_id, password_hash):
+        """Replace the stored password hash of a user without loading it."""
+        db.session.query(cls).filter_by(id=user_id).update({cls.password_hash: password_hash})
+        db.session.commit()
 
     def update(self, **kwargs):
         """Update the user's attributes."""
@@ -80,7 +97,31 @@ class User(db.Model):
 
     @classmethod
     def find_by_username_or_email(cls, identifier):
-        """Find a user by its username or email."""
-        return cls.query.filter(
-            (cls.username == identifier) | (cls.email == identifier),
-        ).first()
+        """
+        Find a user by its username or email.
+
+        The two lookups are combined with UNION ALL instead of OR, so each one is planned as a
+        lookup on its own unique index.
+        """
+        by_username = cls.query.filter(cls.username == identifier)
+        by_email = cls.query.filter(cls.email == identifier)
+        return by_username.union_all(by_email).first()
+
+    @classmethod
+    def find_credentials(cls, identifier):
+        """
+        Find the id and password hash of a user by its username or email.
+
+        Only the columns needed to authenticate are selected, so no `User` instance is built. As in
+        `find_by_username_or_email`, the two lookups are combined with UNION ALL so each is served
+        by its own covering index.
+
+        Returns
+        -------
+        Row or None
+            A row with `id` and `password_hash`, or None if no user matches.
+
+        """
+        by_username = db.session.query(cls.id, cls.password_hash).filter(cls.username == identifier)
+        by_email = db.session.query(cls.id, cls.password_hash).filter(cls.email == identifier)
+        return by_username.union_all(by_email).first()
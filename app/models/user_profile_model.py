@@ -38,7 +38,7 @@ class UserProfile(db.Model):
     __tablename__ = "user_profiles"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     first_name = Column(String(50))
     last_name = Column(String(50))
     date_of_birth = Column(Date, nullable=True)
@@ -50,14 +50,7 @@ class UserProfile(db.Model):
     user = relationship("User", back_populates="profile")
 
     def __repr__(self):
-        return (
-            f"<UserProfile(id={self.id}, "
-            f"user_id={self.user_id}, "
-            f"first_name='{self.first_name}', "
-            f"last_name='{self.last_name}', "
-            f"dob={self.date_of_birth}, "
-            f"updated_at={self.updated_at})>"
-        )
+        return f"<UserProfile(id={self.id}, user_id={self.user_id})>"
 
     def __str__(self):
         """Return a string representation of the user's profile."""
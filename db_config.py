@@ -12,15 +12,22 @@ class Config:
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False  # Disable event notifications to save memory
     SECRET_KEY = os.getenv("SECRET_KEY")  # Default value for SECRET_KEY
+    # Keep enough pooled connections for concurrent requests and drop stale ones after DB restarts
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
 
 
 class DevelopmentConfig(Config):
     """Configurations for Development."""
 
     DEBUG = True
-    SQLALCHEMY_ECHO = True  # Prints SQL queries for debugging
+    SQLALCHEMY_ECHO = os.getenv("SQLALCHEMY_ECHO", "0") == "1"  # Set SQLALCHEMY_ECHO=1 to log SQL queries
     SQLALCHEMY_DATABASE_URI = os.getenv("DEV_DB_URL")
-    print(f"Database URL: {SQLALCHEMY_DATABASE_URI}")
 
 
 class TestingConfig(Config):
@@ -36,6 +43,7 @@ class ProductionConfig(Config):
 
     DEBUG = False
     SQLALCHEMY_ECHO = False
+    SQLALCHEMY_ENGINE_OPTIONS = {**Config.SQLALCHEMY_ENGINE_OPTIONS, "pool_size": 20}
 
 
 # Dictionary to map the environment variable to the appropriate config
@@ -1,12 +1,16 @@
 CREATE TABLE IF NOT EXISTS "users" (
   "id" INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-  "username" varchar UNIQUE NOT NULL,
-  "email" varchar UNIQUE NOT NULL,
+  "username" varchar NOT NULL,
+  "email" varchar NOT NULL,
   "password_hash" varchar NOT NULL,
   "role" varchar DEFAULT 'user',
   "created_at" timestamp default CURRENT_TIMESTAMP
 );
 
+-- Unique indexes that also cover the columns needed to authenticate, so logins are index-only scans
+CREATE UNIQUE INDEX IF NOT EXISTS "ix_users_username" ON "users" ("username") INCLUDE ("id", "password_hash");
+CREATE UNIQUE INDEX IF NOT EXISTS "ix_users_email" ON "users" ("email") INCLUDE ("id", "password_hash");
+
 CREATE TABLE IF NOT EXISTS "user_profiles" (
   "id" INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
   "user_id" integer NOT NULL,
@@ -20,6 +24,9 @@ CREATE TABLE IF NOT EXISTS "user_profiles" (
   CONSTRAINT fk_user_profile_user_id FOREIGN KEY ("user_id") REFERENCES "users" ("id")
 );
 
+-- Serves the join that loads a user's profile together with the user
+CREATE INDEX IF NOT EXISTS "ix_user_profiles_user_id" ON "user_profiles" ("user_id");
+
 CREATE TABLE IF NOT EXISTS "posts" (
   "id" INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
   "user_id" integer NOT NULL,
@@ -28,9 +35,23 @@ CREATE TABLE IF NOT EXISTS "posts" (
   "status" varchar,
   "created_at" timestamp,
   "updated_at" timestamp,
+  "search_vector" tsvector GENERATED ALWAYS AS (
+    to_tsvector('english', coalesce("title", '') || ' ' || coalesce("content", ''))
+  ) STORED,
   CONSTRAINT fk_post_user_id FOREIGN KEY ("user_id") REFERENCES "users" ("id")
 );
 
+-- Full-text search index for Posts.search_posts
+CREATE INDEX IF NOT EXISTS "ix_posts_search" ON "posts" USING gin ("search_vector");
+
+-- Newest-first index for Posts.get_recent_posts (ORDER BY created_at DESC LIMIT n)
+CREATE INDEX IF NOT EXISTS "ix_posts_created_at_desc" ON "posts" ("created_at" DESC);
+
+-- Lookup indexes for Posts.find_by_user, find_by_status and find_by_title
+CREATE INDEX IF NOT EXISTS "ix_posts_user_id" ON "posts" ("user_id");
+CREATE INDEX IF NOT EXISTS "ix_posts_status" ON "posts" ("status");
+CREATE INDEX IF NOT EXISTS "ix_posts_title" ON "posts" ("title");
+
 CREATE TABLE IF NOT EXISTS "comments" (
   "id" INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
   "content" text NOT NULL,
@@ -66,17 +87,25 @@ CREATE TABLE IF NOT EXISTS "categories" (
 CREATE TABLE IF NOT EXISTS "post_tags" (
   "post_id" integer NOT NULL,
   "tag_id" integer NOT NULL,
+  PRIMARY KEY ("post_id", "tag_id"),
   CONSTRAINT fk_post_tags_post_id FOREIGN KEY ("post_id") REFERENCES "posts" ("id"),
   CONSTRAINT fk_post_tags_tag_id FOREIGN KEY ("tag_id") REFERENCES "tags" ("id")
 );
 
+-- The primary key serves lookups by post; this index serves lookups by tag
+CREATE INDEX IF NOT EXISTS "ix_post_tags_tag_id" ON "post_tags" ("tag_id");
+
 CREATE TABLE IF NOT EXISTS "post_categories" (
   "post_id" integer NOT NULL,
   "category_id" integer NOT NULL,
+  PRIMARY KEY ("post_id", "category_id"),
   CONSTRAINT fk_post_categories_post_id FOREIGN KEY ("post_id") REFERENCES "posts" ("id"),
   CONSTRAINT fk_post_categories_category_id FOREIGN KEY ("category_id") REFERENCES "categories" ("id")
 );
 
+-- The primary key serves lookups by post; this index serves lookups by category
+CREATE INDEX IF NOT EXISTS "ix_post_categories_category_id" ON "post_categories" ("category_id");
+
 COMMENT ON COLUMN "users"."password_hash" IS 'Hashed and salted password';
 COMMENT ON COLUMN "posts"."content" IS 'Content of the post in markdown format';
 COMMENT ON COLUMN "comments"."content" IS 'Contents of the comment';
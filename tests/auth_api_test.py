@@ -0,0 +1,38 @@
+"""Tests for the request hooks of the authentication API."""
+
+import os
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("SYNTX_SKIP_WARMUP", "1")
+
+from app import create_app  # noqa: E402
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    from db_config import DevelopmentConfig
+
+    monkeypatch.setattr(DevelopmentConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'test.db'}")
+    return create_app("dev").test_client()
+
+
+@pytest.mark.parametrize("path", ["/signup", "/login", "/refresh", "/logout"])
+def test_cors_preflight_is_not_rejected(client, path):
+    response = client.options(
+        f"/api/authentication{path}",
+        headers={
+            "Origin": "https://example.com",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "Content-Type",
+        },
+    )
+    assert response.status_code == 200
+    assert "Access-Control-Allow-Origin" in response.headers
+
+
+@pytest.mark.parametrize("path", ["/signup", "/login", "/refresh"])
+def test_non_json_post_is_rejected(client, path):
+    response = client.post(f"/api/authentication{path}", data={"field": "value"})
+    assert response.status_code == 415
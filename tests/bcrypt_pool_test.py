@@ -0,0 +1,24 @@
+"""Tests for the bcrypt worker pool."""
+
+import os
+
+os.environ.setdefault("BCRYPT_COST", "4")
+
+from utils.bcrypt_pool import check_dummy_password, check_password, hash_password  # noqa: E402
+
+LONG_PASSWORD = "Passw0rd!" * 12  # 108 bytes, more than bcrypt uses
+
+
+def test_long_password_matches_its_hash():
+    password_hash = hash_password(LONG_PASSWORD)
+    assert check_password(LONG_PASSWORD, password_hash)
+    assert not check_password("Passw0rd!", password_hash)
+
+
+def test_long_password_against_dummy_hash_fails_without_error():
+    assert check_dummy_password(LONG_PASSWORD) is False
+
+
+def test_hash_of_truncated_password_stays_valid():
+    password_hash = hash_password(LONG_PASSWORD[:72])
+    assert check_password(LONG_PASSWORD, password_hash)
@@ -0,0 +1,55 @@
+"""Tests for the cached list of tags."""
+
+import os
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("SYNTX_SKIP_WARMUP", "1")
+
+from app import create_app, db  # noqa: E402
+from app.models.tags_model import Tags  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    from db_config import DevelopmentConfig
+
+    monkeypatch.setattr(DevelopmentConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'test.db'}")
+    app = create_app("dev")
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+def _tag_names():
+    return [tag["tag_name"] for tag in Tags.get_all_dicts()]
+
+
+def test_rolled_back_tags_are_not_served_from_the_cache(app):
+    db.session.add(Tags("phantom"))
+    db.session.flush()
+    assert _tag_names() == ["phantom"]
+
+    db.session.rollback()
+    assert _tag_names() == []
+
+
+def test_committed_tags_replace_the_cached_list(app):
+    assert _tag_names() == []
+
+    db.session.add(Tags("python"))
+    db.session.flush()
+    db.session.commit()
+    assert _tag_names() == ["python"]
+
+
+def test_callers_cannot_change_the_cached_list(app):
+    db.session.add(Tags("python"))
+    db.session.commit()
+
+    tags = Tags.get_all_dicts()
+    tags[0]["tag_name"] = "changed"
+    tags.append({})
+    assert _tag_names() == ["python"]
@@ -0,0 +1,210 @@
+"""
+Bcrypt worker pool.
+
+This module runs bcrypt hashing and verification on a bounded pool of worker threads. A single
+bcrypt operation takes tens to hundreds of milliseconds of CPU, so running it directly on the
+request thread lets a burst of sign-ups or logins tie up every worker of the server. Jobs are
+admitted through a semaphore; once too many are pending, new ones are rejected immediately with
+`BcryptPoolBusyError` so callers can answer with HTTP 503 instead of queueing without bound.
+
+bcrypt releases the GIL while hashing, so threads are enough to use every CPU core.
+
+Salts are pre-generated by a background thread into a bounded reservoir, so `hash_password`
+normally takes a ready salt instead of reading from the system random source on the request path.
+
+The work factor is read from the `BCRYPT_COST` environment variable (default 12). Hashes made
+with another work factor keep working, and `needs_rehash` tells callers when to replace them.
+
+bcrypt only uses the first 72 bytes of a password. Older bcrypt releases drop the rest silently
+while newer ones raise `ValueError`, so passwords are truncated to `MAX_PASSWORD_BYTES` here, which
+keeps existing hashes valid with either release.
+
+Functions
+---------
+hash_password(password)
+    Hash a password with a freshly generated salt.
+
+check_password(password, password_hash)
+    Check a password against a stored bcrypt hash.
+
+check_dummy_password(password)
+    Spend the work of a password check when there is no stored hash to check against.
+
+needs_rehash(password_hash)
+    Tell whether a stored hash was made with a different work factor than the configured one.
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+
+import bcrypt
+
+BCRYPT_COST = int(os.getenv("BCRYPT_COST", "12"))
+MAX_PENDING_JOBS = int(os.getenv("BCRYPT_MAX_PENDING_JOBS", "500"))
+MAX_PASSWORD_BYTES = 72  # bcrypt ignores anything past this
+
+_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+_pending_jobs = threading.BoundedSemaphore(MAX_PENDING_JOBS)
+
+SALT_RESERVOIR_SIZE = 256
+_salts = queue.Queue(maxsize=SALT_RESERVOIR_SIZE)
+_salt_filler = None
+_salt_filler_lock = threading.Lock()
+
+
+class BcryptPoolBusyError(Exception):
+    """Raised when the bcrypt pool already has `MAX_PENDING_JOBS` jobs pending."""
+
+
+def _run(func, *args):
+    """Run `func(*args)` on the pool and wait for its result, rejecting it if the pool is saturated."""
+    if not _pending_jobs.acquire(blocking=False):
+        raise BcryptPoolBusyError("Too many pending bcrypt jobs")
+    try:
+        return _executor.submit(func, *args).result()
+    finally:
+        _pending_jobs.release()
+
+
+def _encode(password):
+    """Encode a password for bcrypt, keeping only the bytes bcrypt uses."""
+    return password.encode("utf-8")[:MAX_PASSWORD_BYTES]
+
+
+def _fill_salts():
+    """Keep the salt reservoir topped up; blocks while it is full."""
+    while True:
+        _salts.put(bcrypt.gensalt(rounds=BCRYPT_COST))
+
+
+def _get_salt():
+    """Take a pre-generated salt, generating one inline if the reservoir is empty."""
+    global _salt_filler  # noqa: PLW0603
+
+    # The filler is started on first use rather than at import
+    if _salt_filler is None:
+        with _salt_filler_lock:
+            if _salt_filler is None:
+                _salt_filler = threading.Thread(target=_fill_salts, name="bcrypt-salts", daemon=True)
+                _salt_filler.start()
+
+    try:
+        return _salts.get_nowait()
+    except queue.Empty:
+        return bcrypt.gensalt(rounds=BCRYPT_COST)
+
+
+def _reset_after_fork():
+    """Give a forked worker process its own pool, since threads and their locks do not survive a fork."""
+    global _executor, _pending_jobs, _salts, _salt_filler, _salt_filler_lock  # noqa: PLW0603
+
+    _executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+    _pending_jobs = threading.BoundedSemaphore(MAX_PENDING_JOBS)
+    _salts = queue.Queue(maxsize=SALT_RESERVOIR_SIZE)
+    _salt_filler = None
+    _salt_filler_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def hash_password(password):
+    """
+    Hash a password with bcrypt.
+
+    Parameters
+    ----------
+    password : str
+        The plain-text password.
+
+    Returns
+    -------
+    str
+        The bcrypt hash, including its salt and cost.
+
+    Raises
+    ------
+    BcryptPoolBusyError
+        If too many bcrypt jobs are already pending.
+
+    """
+    return _run(bcrypt.hashpw, _encode(password), _get_salt()).decode("utf-8")
+
+
+def check_password(password, password_hash):
+    """
+    Check a password against a bcrypt hash.
+
+    Parameters
+    ----------
+    password : str
+        The plain-text password.
+    password_hash : str
+        The stored bcrypt hash.
+
+    Returns
+    -------
+    bool
+        True if the password matches the hash, False otherwise.
+
+    Raises
+    ------
+    BcryptPoolBusyError
+        If too many bcrypt jobs are already pending.
+
+    """
+    return _run(bcrypt.checkpw, _encode(password), password_hash.encode("utf-8"))
+
+
+@cache
+def _dummy_hash():
+    """Return a fixed hash with the configured cost, computed on first use."""
+    return _run(bcrypt.hashpw, b"dummy-password", bcrypt.gensalt(rounds=BCRYPT_COST))
+
+
+def check_dummy_password(password):
+    """
+    Check a password against a fixed dummy hash and always fail.
+
+    Used when no user matches a login attempt, so the response takes as long as a real password
+    check and its timing does not reveal whether the account exists.
+
+    Parameters
+    ----------
+    password : str
+        The plain-text password.
+
+    Returns
+    -------
+    bool
+        Always False.
+
+    Raises
+    ------
+    BcryptPoolBusyError
+        If too many bcrypt jobs are already pending.
+
+    """
+    _run(bcrypt.checkpw, _encode(password), _dummy_hash())
+    return False
+
+
+def needs_rehash(password_hash):
+    """
+    Tell whether a bcrypt hash was made with a different work factor than `BCRYPT_COST`.
+
+    Parameters
+    ----------
+    password_hash : str
+        The stored bcrypt hash, e.g. "$2b$12$...".
+
+    Returns
+    -------
+    bool
+        True if the hash should be replaced with one of the configured cost.
+
+    """
+    return int(password_hash.split("$", 3)[2]) != BCRYPT_COST
@@ -10,6 +10,9 @@ Functions
 save_to_db(model)
     Save a given model instance to the database.
 
+save_many(models)
+    Save several model instances to the database in a single commit.
+
 delete_from_db(model)
     Delete a given model instance from the database.
 
@@ -17,7 +20,7 @@ update(model, **kwargs)
     Update the attributes of a given model instance, with an option to update the `updated_at` timestamp.
 """
 
-from datetime import datetime, timezone
+from sqlalchemy import func
 
 from app import db
 
@@ -28,6 +31,12 @@ def save_to_db(model):
     db.session.commit()
 
 
+def save_many(models):
+    """Save several model instances with a single commit."""
+    db.session.add_all(models)
+    db.session.commit()
+
+
 def delete_from_db(model):
     """Delete the user from the database."""
     db.session.delete(model)
@@ -54,5 +63,6 @@ def update(model, **kwargs):
     for key, value in kwargs.items():
         setattr(model, key, value)
     if update_timestamp:
-        model.updated_at = datetime.now(timezone.utc)
+        # Let the database fill in the timestamp when the UPDATE is executed
+        model.updated_at = func.now()
     db.session.commit()
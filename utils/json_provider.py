@@ -0,0 +1,47 @@
+"""
+msgspec-backed JSON provider for Flask.
+
+This module defines `MsgspecJSONProvider`, which replaces Flask's default `json`-module provider so
+that `jsonify`, `request.get_json` and every other use of `app.json` go through msgspec's C
+encoder and decoder. Responses are encoded straight to bytes, skipping the intermediate `str`.
+
+Differences from Flask's default provider: keys are not sorted, and `datetime`/`date` values are
+encoded as ISO 8601 strings instead of HTTP dates.
+
+Classes:
+    - MsgspecJSONProvider: A Flask JSON provider using msgspec.
+"""
+
+import msgspec
+from flask.json.provider import JSONProvider
+
+_encoder = msgspec.json.Encoder()
+_decoder = msgspec.json.Decoder()
+
+
+class MsgspecJSONProvider(JSONProvider):
+    """Flask JSON provider that serializes and parses JSON with msgspec."""
+
+    def dumps(self, obj, **kwargs):
+        """Serialize data as a JSON string."""
+        return _encoder.encode(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        """
+        Deserialize JSON text or UTF-8 bytes.
+
+        Raises
+        ------
+        ValueError
+            If the data is not valid JSON, which is what Flask expects in order to answer with 400.
+
+        """
+        try:
+            return _decoder.decode(s)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    def response(self, *args, **kwargs):
+        """Serialize the arguments as JSON directly into the body of an `application/json` response."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(_encoder.encode(obj), mimetype="application/json")
@@ -8,23 +8,129 @@ and are used to securely transmit user-related information, such as `user_id`.
 The utility functions include:
     - create_token: Generates a JWT token with a payload (e.g., `user_id`).
     - verify_token: Verifies the validity of the provided JWT token.
+
+Verified claims are kept in a small in-process LRU cache for a few seconds, so a client that sends
+the same token on consecutive requests only pays for the signature check once per TTL window.
+
+When `REDIS_URL` is set, logged-out tokens are blacklisted in Redis, so the blacklist is shared by
+all workers, survives restarts and expires entries together with the tokens. Without it, an
+in-process blacklist with the same expiry is used, which is only suitable for a single development
+process.
 """
 
+import hashlib
+import heapq
 import os
-from datetime import datetime, timedelta, timezone
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
 
 import jwt
-from dotenv import load_dotenv
-from flask import jsonify, request
+from flask import g, jsonify, request
 
+from app import db
 from app.models.user_model import User
 
-load_dotenv()
+# `.env` has been loaded, and the key checked, by the auth blueprint when it was registered
+# (see app/api/__init__.py)
+SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+REDIS_URL = os.getenv("REDIS_URL")
 
-blacklist = set()  # In-memory blacklist for testing purposes
+# Encode the key once instead of on every encode/decode, and skip claim checks the tokens never use
+_SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8") if SECRET_KEY else None
+_DECODE_OPTIONS = {"verify_aud": False, "verify_iss": False}
+
+# Cache of verified token claims, keyed by the SHA-256 digest of the token
+TOKEN_CACHE_TTL = 5  # seconds
+TOKEN_CACHE_MAX_ENTRIES = 10_000
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def _remaining_lifetime(token):
+    """Return the number of seconds until a token expires."""
+    # The token has already been verified by `token_required`, only its expiry is needed here
+    claims = jwt.decode(token, options={"verify_signature": False})
+    return claims["exp"] - time.time()
+
+
+def _token_digest(token):
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class RedisBlacklist:
+    """
+    Blacklist of revoked JWT tokens stored in Redis.
+
+    Each token is stored under the SHA-256 digest of the token with a TTL equal to the token's
+    remaining lifetime, so Redis drops the entry once the token would have expired anyway.
+
+    Parameters
+    ----------
+    client : redis.Redis
+        The Redis client to use.
+
+    """
+
+    KEY_PREFIX = "token:blacklist:"
+
+    def __init__(self, client):
+        self.client = client
+
+    def _key(self, token):
+        return self.KEY_PREFIX + _token_digest(token)
+
+    def add(self, token):
+        """Blacklist a token until it expires."""
+        ttl = int(_remaining_lifetime(token))
+        if ttl > 0:
+            self.client.setex(self._key(token), ttl, 1)
+
+    def __contains__(self, token):
+        return self.client.exists(self._key(token)) > 0
+
+
+class MemoryBlacklist:
+    """
+    Blacklist of revoked JWT tokens kept in process memory.
+
+    Entries map the SHA-256 digest of a token to its expiry time. A min-heap of the expiry times
+    lets each `add` drop just the entries that have expired since, rather than scanning all of them,
+    so the blacklist only holds tokens that are still valid.
+    """
+
+    def __init__(self):
+        self._expiry = {}
+        self._heap = []  # (expiry time, digest), earliest first
+        self._lock = threading.Lock()
+
+    def add(self, token):
+        """Blacklist a token until it expires."""
+        now = time.time()
+        expires_at = now + _remaining_lifetime(token)
+        key = _token_digest(token)
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                exp, expired_key = heapq.heappop(self._heap)
+                # Skip stale heap items of tokens that have been blacklisted again since
+                if self._expiry.get(expired_key) == exp:
+                    del self._expiry[expired_key]
+            if expires_at > now:
+                self._expiry[key] = expires_at
+                heapq.heappush(self._heap, (expires_at, key))
+
+    def __contains__(self, token):
+        expires_at = self._expiry.get(_token_digest(token))
+        return expires_at is not None and expires_at > time.time()
 
-SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+
+if REDIS_URL:
+    import redis
+
+    blacklist = RedisBlacklist(redis.Redis.from_url(REDIS_URL))
+else:
+    blacklist = MemoryBlacklist()
 
 
 def generate_token(user_id, expires_in=3600):
@@ -44,13 +150,13 @@ def generate_token(user_id, expires_in=3600):
         A JWT token.
 
     """
-    exp = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+    exp = int(time.time()) + expires_in
     token = jwt.encode(
         {
             "user_id": user_id,
             "exp": exp,
         },
-        SECRET_KEY,
+        _SECRET_KEY_BYTES,
         algorithm="HS256",
     )
     return token
@@ -74,18 +180,67 @@ def generate_refresh_token(user_id):
         A refresh JWT token.
 
     """
-    exp = datetime.now(timezone.utc) + timedelta(days=7)  # Refresh token lasts for 7 days
+    exp = int(time.time()) + 7 * 24 * 3600  # Refresh token lasts for 7 days
     refresh_token = jwt.encode(
         {
             "user_id": user_id,
             "exp": exp,
         },
-        SECRET_KEY,
+        _SECRET_KEY_BYTES,
         algorithm="HS256",
     )
     return refresh_token
 
 
+def decode_token(token):
+    """
+    Decode and verify a JWT token, reusing recently verified claims for the same token.
+
+    On a cache miss the signature and expiry are verified with `jwt.decode` and the claims are
+    cached until `TOKEN_CACHE_TTL` seconds have passed or the token expires, whichever comes first.
+    Blacklisting is not handled here and must still be checked by the caller.
+
+    Parameters
+    ----------
+    token : str
+        The JWT token to be decoded.
+
+    Returns
+    -------
+    dict
+        The decoded token data.
+
+    Raises
+    ------
+    jwt.ExpiredSignatureError
+        If the token has expired.
+    jwt.InvalidTokenError
+        If the token is invalid.
+
+    """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    now = time.time()
+
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+        if cached is not None:
+            claims, cached_until = cached
+            if now < cached_until:
+                _token_cache.move_to_end(key)
+                return claims
+            del _token_cache[key]
+
+    claims = jwt.decode(token, _SECRET_KEY_BYTES, algorithms=["HS256"], options=_DECODE_OPTIONS)
+
+    with _token_cache_lock:
+        _token_cache[key] = (claims, min(claims["exp"], now + TOKEN_CACHE_TTL))
+        _token_cache.move_to_end(key)
+        while len(_token_cache) > TOKEN_CACHE_MAX_ENTRIES:
+            _token_cache.popitem(last=False)
+
+    return claims
+
+
 def verify_token(token):
     """
     Verify a JWT token and extract the user ID.
@@ -102,21 +257,39 @@ def verify_token(token):
 
     """
     try:
-        decode_token = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-        return decode_token
+        return decode_token(token)
     except jwt.ExpiredSignatureError:
         return None  # Token expired
     except jwt.InvalidTokenError:
         return None  # Invalid token
 
 
+def get_bearer_token():
+    """
+    Extract the token from the request's `Authorization: Bearer <token>` header.
+
+    Returns
+    -------
+    str or None
+        The token, or None if the header is missing, empty or does not use the Bearer scheme.
+
+    """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token
+
+
 def token_required(func):
     """
     Enforce JWT token authentication for protected routes.
 
     This decorator function checks for the presence of a valid JWT token in the request headers.
-    If the token is missing, expired, or invalid, the request is rejected with an appropriate error message.
+    If the header is missing or malformed, the request is rejected with 401; if the token is expired, invalid
+    or blacklisted, it is rejected with 403.
     Otherwise, it extracts the current user from the token and passes it to the decorated route handler.
+    The user is loaded once per request and kept on `flask.g`, so nested or repeated checks within the
+    same request do not query it again.
 
     Parameters
     ----------
@@ -132,24 +305,23 @@ def token_required(func):
 
     @wraps(func)
     def decorated(*args, **kwargs):
-        token = None
-
         # Get token from headers
-        if "Authorization" in request.headers:
-            token = request.headers["Authorization"].split(" ")[1]  # Expecting "Bearer <token>"
+        token = get_bearer_token()
 
         if not token:
-            return jsonify({"message": "Token is missing!"}), 403
+            return jsonify({"message": "Invalid Authorization header"}), 401
 
         try:
             # Decode the token and extract user info
-            data = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+            data = decode_token(token)
 
             # Check if the token is blacklisted
             if token in blacklist:
                 return jsonify({"message": "Token has been blacklisted!"}), 403
 
-            current_user = User.query.filter_by(id=data["user_id"]).first()
+            current_user = g.get("current_user")
+            if current_user is None or current_user.id != data["user_id"]:
+                current_user = g.current_user = db.session.get(User, data["user_id"])
         except jwt.ExpiredSignatureError:
             return jsonify({"message": "Token has expired!"}), 403
         except jwt.InvalidTokenError:
@@ -5,40 +5,112 @@ This module provides functions for validating email addresses and passwords. It
 using a regular expression, advanced validation with the `email-validator` library, and optional
 MX record validation to check if the domain can receive emails.
 
+The MX lookups also have asyncio variants, so that many addresses can be validated concurrently
+instead of waiting on one DNS query after the other. At most `MAX_CONCURRENT_DNS_QUERIES` queries
+run at once per event loop, and concurrent lookups of the same domain share a single query.
+
+A domain without MX records is checked for A and then AAAA records, since mail is delivered to the
+domain itself in that case (RFC 5321, section 5.1). Each DNS query gives up after `DNS_QUERY_TIMEOUT`
+seconds.
+
+The one-time setup of `email-validator` and of the DNS resolvers can be run ahead of the first
+validation with `warmup()`, which `create_app` calls unless `SYNTX_SKIP_WARMUP` is set.
+
 Functions:
     - is_valid_format(email): Validates the format of an email address using a regular expression.
     - get_mx_records(domain): Retrieves the MX records for a given domain.
-    - validate_email_address(email, check_mx=True, debug=False): Validates an email address, with
-      options for MX record checking and debug logging.
+    - validate_email_address(email, check_mx=True, debug=False, normalize=False): Validates an email
+      address, with options for MX record checking and the `email-validator` checks.
+    - aget_mx_records(domain): Async variant of `get_mx_records`.
+    - avalidate_email_address(email, check_mx=True, normalize=False): Async variant of
+      `validate_email_address`.
+    - validate_many(emails, check_mx=True, normalize=False): Validates several email addresses concurrently.
+    - warmup(): Runs the one-time setup of `email-validator` and the DNS resolvers.
 """
 
+import asyncio
 import logging
 import re
-
+import string
+import threading
+import time
+import weakref
+from functools import cache, lru_cache
+
+import dns.asyncresolver
+import dns.name
 import dns.resolver
+from cachetools import TLRUCache
 from dns.exception import DNSException
 from email_validator import EmailNotValidError
 from email_validator import validate_email as email_validator
 
 # Constants
-MX_DNS_CACHE = {}
+MX_CACHE_MAX_ENTRIES = 10_000
+MX_CACHE_TTL = 300  # seconds, for domains with MX records
+MX_NEGATIVE_CACHE_TTL = 30  # seconds, for domains without (which may be a transient DNS failure)
+
+
+def _mx_cache_expiry(domain, mx_records, now):
+    return now + (MX_CACHE_TTL if mx_records else MX_NEGATIVE_CACHE_TTL)
+
 
-# Regular expression for email format validation
+# Bounded cache of MX lookups; entries expire so that DNS changes and failures are picked up again
+MX_DNS_CACHE = TLRUCache(maxsize=MX_CACHE_MAX_ENTRIES, ttu=_mx_cache_expiry, timer=time.monotonic)
+_mx_cache_lock = threading.Lock()
+_MISSING = object()
+_mx_cache_get = MX_DNS_CACHE.get
+
+DNS_QUERY_TIMEOUT = 2.0  # seconds, for each DNS query
+# Record types tried, in order, for a domain without MX records (RFC 5321, section 5.1)
+_FALLBACK_RDTYPES = ("A", "AAAA")
+
+# Limit of the async MX queries in flight, and the per-event-loop state enforcing it: a semaphore and
+# the pending lookup task of each domain (asyncio primitives cannot be shared between event loops).
+# A loop's entry is dropped as soon as its last lookup finishes, since a semaphore that has had to
+# wait holds a reference to its loop and would otherwise keep the weak key alive.
+MAX_CONCURRENT_DNS_QUERIES = 64
+_async_lookups = weakref.WeakKeyDictionary()
+
+# Regular expression for email format validation. `\A` and `\Z` anchor the whole string; unlike `$`,
+# `\Z` does not accept a trailing newline.
 EMAIL_REGEX = (
-    r"^[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)"
+    r"\A[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)"
     r"*@(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+"
-    r"[a-z0-9](?:[a-z0-9-]*[a-z0-9])?$"
+    r"[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\Z"
 )
+_EMAIL_RE = re.compile(EMAIL_REGEX)
+_email_re_match = _EMAIL_RE.match  # bound once, skipping the attribute lookup on every call
 
-# Set up logging
+# Matches passwords that satisfy every rule of `validate_password` (8-20 characters with at least one
+# digit, uppercase letter, lowercase letter and special symbol), so valid passwords need one regex pass
+PASSWORD_REGEX = r"\A(?=[^0-9]*[0-9])(?=[^A-Z]*[A-Z])(?=[^a-z]*[a-z])(?=[^!@#$%^&*-]*[!@#$%^&*-]).{8,20}\Z"
+_PASSWORD_RE = re.compile(PASSWORD_REGEX, re.DOTALL)
+
+# Character classes required in a password
+_DIGITS = frozenset(string.digits)
+_UPPERCASE = frozenset(string.ascii_uppercase)
+_LOWERCASE = frozenset(string.ascii_lowercase)
+_SPECIAL_SYMBOLS = frozenset("!@#$%^&*-")
+
+# Set up logging; the level is left to the application's logging configuration
 logger = logging.getLogger("email_validation")
-logger.setLevel(logging.DEBUG)
+
+
+@lru_cache(maxsize=65536)
+def _email_match(email):
+    """Match an email against the format regex; memoized, since the same addresses recur."""
+    return _email_re_match(email) is not None
 
 
 def is_valid_format(email):
     """
     Check if the email format is valid using a regular expression.
 
+    Input longer than 254 characters (the maximum length of an address) or without exactly one `@`
+    is rejected before the regular expression runs, so only plausible addresses reach (and are kept
+    in) the memoized match.
+
     Args:
     ----
         email (str): The email address to validate.
@@ -48,7 +120,101 @@ def is_valid_format(email):
         bool: True if the email format is valid, False otherwise.
 
     """
-    return re.match(EMAIL_REGEX, email) is not None
+    if not 3 <= len(email) <= 254 or email.count("@") != 1:
+        return False
+    return _email_match(email)
+
+
+def _cached_mx_records(domain):
+    """Return the cached MX records of a domain, or `_MISSING` if they are not cached."""
+    with _mx_cache_lock:
+        return _mx_cache_get(domain, _MISSING)
+
+
+def _cache_mx_records(domain, mx_records):
+    """Cache and return the MX records of a domain."""
+    with _mx_cache_lock:
+        MX_DNS_CACHE[domain] = mx_records
+    return mx_records
+
+
+def _mx_hosts(answers):
+    """Return the (exchange, preference) tuples of an MX answer, or None for a null MX (RFC 7505)."""
+    if len(answers) == 1 and answers[0].exchange == dns.name.root:
+        return None
+    return [(r.exchange.to_text(), r.preference) for r in answers]
+
+
+def _resolve_mail_hosts(domain):
+    """
+    Resolve the mail hosts of a domain as (exchange, preference) tuples, or None if it has none.
+
+    A domain without MX records receives mail at its own address (RFC 5321, section 5.1), so its A and
+    then AAAA records are tried next. Other DNS errors, like a non-existent domain, are raised.
+    """
+    try:
+        return _mx_hosts(dns.resolver.resolve(domain, "MX", lifetime=DNS_QUERY_TIMEOUT))
+    except dns.resolver.NoAnswer:
+        pass
+
+    for rdtype in _FALLBACK_RDTYPES:
+        try:
+            dns.resolver.resolve(domain, rdtype, lifetime=DNS_QUERY_TIMEOUT)
+        except dns.resolver.NoAnswer:
+            continue
+        return [(domain, 0)]
+    return None
+
+
+async def _aresolve_mail_hosts(domain):
+    """Async variant of `_resolve_mail_hosts`."""
+    resolver = _async_resolver()
+    try:
+        return _mx_hosts(await resolver.resolve(domain, "MX", lifetime=DNS_QUERY_TIMEOUT))
+    except dns.resolver.NoAnswer:
+        pass
+
+    for rdtype in _FALLBACK_RDTYPES:
+        try:
+            await resolver.resolve(domain, rdtype, lifetime=DNS_QUERY_TIMEOUT)
+        except dns.resolver.NoAnswer:
+            continue
+        return [(domain, 0)]
+    return None
+
+
+@cache
+def _async_resolver():
+    """Return the resolver of the async lookups, created on first use as it reads the system DNS config."""
+    return dns.asyncresolver.Resolver()
+
+
+def _loop_lookups(loop):
+    """Return the semaphore and in-flight lookups of an event loop."""
+    lookups = _async_lookups.get(loop)
+    if lookups is None:
+        lookups = _async_lookups[loop] = (asyncio.Semaphore(MAX_CONCURRENT_DNS_QUERIES), {})
+    return lookups
+
+
+def _lookup_done(loop, domain):
+    """Forget a finished lookup, and the state of its loop once no lookup is left in flight."""
+    in_flight = _async_lookups[loop][1]
+    del in_flight[domain]
+    if not in_flight:
+        del _async_lookups[loop]
+
+
+async def _aresolve_mx_records(domain, semaphore):
+    """Resolve and cache the MX records of a domain, waiting for a free slot first."""
+    async with semaphore:
+        try:
+            mx_records = await _aresolve_mail_hosts(domain)
+        except DNSException as e:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("DNSException: %s", e)
+            mx_records = None
+    return _cache_mx_records(domain, mx_records)
 
 
 def get_mx_records(domain):
@@ -56,7 +222,8 @@ def get_mx_records(domain):
     Fetch the MX records for the given domain.
 
     This function retrieves the Mail Exchange (MX) records for the specified domain using DNS queries.
-    The results are cached to reduce the number of DNS lookups for the same domain.
+    The results are cached to reduce the number of DNS lookups for the same domain: for
+    `MX_CACHE_TTL` seconds when records are found and for `MX_NEGATIVE_CACHE_TTL` seconds when not.
 
     Args:
     ----
@@ -64,36 +231,70 @@ def get_mx_records(domain):
 
     Returns:
     -------
-        list: A list of tuples containing MX records (exchange, preference) if found, otherwise None.
+        list: A list of tuples containing MX records (exchange, preference) if found, `[(domain, 0)]` if
+        the domain has no MX but an A or AAAA record, otherwise None.
 
     """
-    if domain in MX_DNS_CACHE:
-        return MX_DNS_CACHE[domain]
+    cached = _cached_mx_records(domain)
+    if cached is not _MISSING:
+        return cached
 
     try:
-        answers = dns.resolver.resolve(domain, "MX")
-        mx_records = [(r.exchange.to_text(), r.preference) for r in answers]
-        MX_DNS_CACHE[domain] = mx_records
-        return mx_records
+        mx_records = _resolve_mail_hosts(domain)
     except DNSException as e:
-        logger.debug("DNSException: %s", e)
-        MX_DNS_CACHE[domain] = None
-        return None
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("DNSException: %s", e)
+        mx_records = None
+    return _cache_mx_records(domain, mx_records)
+
+
+async def aget_mx_records(domain):
+    """
+    Fetch the MX records for the given domain without blocking the event loop.
+
+    This is the async variant of `get_mx_records` and shares its cache. Concurrent calls for the
+    same domain wait on the same DNS query.
+
+    Args:
+    ----
+        domain (str): The domain part of an email address.
+
+    Returns:
+    -------
+        list: A list of tuples containing MX records (exchange, preference) if found, `[(domain, 0)]` if
+        the domain has no MX but an A or AAAA record, otherwise None.
+
+    """
+    cached = _cached_mx_records(domain)
+    if cached is not _MISSING:
+        return cached
+
+    loop = asyncio.get_running_loop()
+    semaphore, in_flight = _loop_lookups(loop)
+    lookup = in_flight.get(domain)
+    if lookup is None:
+        lookup = in_flight[domain] = asyncio.ensure_future(_aresolve_mx_records(domain, semaphore))
+        lookup.add_done_callback(lambda _: _lookup_done(loop, domain))
+    # Shielded, so a caller being cancelled does not cancel the lookup the other callers wait on
+    return await asyncio.shield(lookup)
 
 
-def validate_email_address(email, check_mx=True, debug=False):
+def validate_email_address(email, check_mx=True, debug=False, normalize=False):
     """
-    Validate the email address with options for MX validation and debug logging.
+    Validate the email address with an option for MX validation.
 
     This function validates an email address by checking its format and optionally verifying that
-    the domain has valid MX records. It also performs advanced validation using the `email-validator`
-    library, which checks for issues like invalid characters and incorrect structure.
+    the domain has valid MX records. With `normalize`, it also performs the advanced validation the
+    `email-validator` library applies when normalizing an address, which checks for issues like
+    over-long labels and special-use domains; it costs about a hundred times the format check.
 
     Args:
     ----
         email (str): The email address to validate.
         check_mx (bool): If True, perform MX record validation to ensure the domain can receive emails (default is True).
-        debug (bool): If True, enables debug logging (default is False).
+            If False, no DNS queries are made at all.
+        debug (bool): Ignored, kept for backward compatibility. Configure the `email_validation` logger instead.
+        normalize (bool): If True, also run the checks of the `email-validator` library (default is False).
 
     Returns:
     -------
@@ -101,30 +302,87 @@ def validate_email_address(email, check_mx=True, debug=False):
               False if the email format is invalid or if MX records are required and not found.
 
     """
-    if debug:
-        logging.basicConfig()
-
     try:
         # Valid format check
         if not is_valid_format(email):
             return False
 
-        # Advanced validation with the email-validator library
-        email_validator(email)
+        # Advanced validation with the email-validator library; its own DNS deliverability check is
+        # left out since the (cached) MX lookup below covers it
+        if normalize:
+            email_validator(email, check_deliverability=False)
 
         # Check MX records if required
         if check_mx:
-            domain = email.split("@")[1]
+            domain = email.rpartition("@")[2]
             if not get_mx_records(domain):
                 return False
 
         return True
 
     except EmailNotValidError as e:
-        logger.debug("EmailNotValidError: %s", e)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("EmailNotValidError: %s", e)
         return False
 
 
+async def avalidate_email_address(email, check_mx=True, normalize=False):
+    """
+    Validate the email address without blocking the event loop.
+
+    This is the async variant of `validate_email_address`; the domain is checked with
+    `aget_mx_records`.
+
+    Args:
+    ----
+        email (str): The email address to validate.
+        check_mx (bool): If True, perform MX record validation to ensure the domain can receive emails (default is True).
+        normalize (bool): If True, also run the checks of the `email-validator` library (default is False).
+
+    Returns:
+    -------
+        bool: True if the email address is valid and, if `check_mx` is True, has valid MX records.
+
+    """
+    if not is_valid_format(email):
+        return False
+
+    if normalize:
+        try:
+            email_validator(email, check_deliverability=False)
+        except EmailNotValidError as e:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("EmailNotValidError: %s", e)
+            return False
+
+    if check_mx:
+        domain = email.rpartition("@")[2]
+        if not await aget_mx_records(domain):
+            return False
+
+    return True
+
+
+async def validate_many(emails, check_mx=True, normalize=False):
+    """
+    Validate several email addresses concurrently.
+
+    Args:
+    ----
+        emails (iterable of str): The email addresses to validate.
+        check_mx (bool): If True, perform MX record validation for each address (default is True).
+        normalize (bool): If True, also run the checks of the `email-validator` library (default is False).
+
+    Returns:
+    -------
+        list of bool: The result of `avalidate_email_address` for each address, in the same order.
+
+    """
+    return await asyncio.gather(
+        *(avalidate_email_address(email, check_mx=check_mx, normalize=normalize) for email in emails),
+    )
+
+
 def validate_password(password):
     """
     Validate a password to ensure it meets specific security criteria.
@@ -144,36 +402,32 @@ def validate_password(password):
     Returns:
     -------
         bool: True if the password meets all the requirements, False otherwise.
-        list: A list of error messages indicating which requirements were not met.
+        list: A list of error messages indicating which requirements were not met. A password that is
+              too long only gets the length error.
 
     """
+    # Too long fails on length alone, so such a password is rejected without being scanned at all
+    # (the request body has no size limit, so it may be arbitrarily large)
+    if len(password) > 20:
+        return False, ["Password should not be more than 20 characters long"]
+
+    # Fast path: a valid password is accepted in one pass, the per-rule checks below only build the errors
+    if _PASSWORD_RE.match(password):
+        return True, []
+
     errors = []
-    special_sym = ["!", "@", "#", "$", "%", "^", "&", "*", "-"]
     val = True
 
     if len(password) < 8:
         errors.append("Password must be at least 8 characters long")
         val = False
-    if len(password) > 20:
-        errors.append("Password should not be more than 20 characters long")
-        val = False
 
     # Check if password contains at least one digit, uppercase letter, lowercase letter, and special symbol
-    has_digit = False
-    has_upper = False
-    has_lower = False
-    has_symbol = False
-
-    # Check the characters in the password using ASCII
-    for char in password:
-        if 48 <= ord(char) <= 57:
-            has_digit = True
-        elif 65 <= ord(char) <= 90:
-            has_upper = True
-        elif 97 <= ord(char) <= 122:
-            has_lower = True
-        elif char in special_sym:
-            has_symbol = True
+    chars = set(password)
+    has_digit = not _DIGITS.isdisjoint(chars)
+    has_upper = not _UPPERCASE.isdisjoint(chars)
+    has_lower = not _LOWERCASE.isdisjoint(chars)
+    has_symbol = not _SPECIAL_SYMBOLS.isdisjoint(chars)
 
     if not has_digit:
         errors.append("Password must contain at least one digit")
@@ -189,3 +443,13 @@ def validate_password(password):
         val = False
 
     return val, errors
+
+
+def warmup():
+    """Run the lazy one-time setup of `email-validator` and the DNS resolvers."""
+    email_validator("warmup@example.com", check_deliverability=False)
+    try:
+        dns.resolver.get_default_resolver()
+        _async_resolver()
+    except DNSException as e:
+        logger.debug("DNSException: %s", e)